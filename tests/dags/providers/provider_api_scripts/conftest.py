@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pytest
+from providers.provider_api_scripts import jamendo
+
+
+RESOURCES = Path(__file__).parent.resolve() / "resources"
+
+
+def load_resource(provider: str, name: str):
+    """
+    Parse a JSON resource file for the given provider in one shot.
+
+    Decoding straight from bytes skips the TextIOWrapper and UTF-8 pre-decode
+    that open()+json.load() would pay.
+    """
+    return json.loads((RESOURCES / provider / name).read_bytes())
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cleanse_url():
+    # Prevent calling out to Jamendo & speed up tests. We only ever need a
+    # constant passthrough and no test inspects call history, so a plain
+    # attribute swap via MonkeyPatch beats a full mock.patch. str is an
+    # identity for the str URLs passed here and avoids a Python-level
+    # lambda frame per call.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(jamendo, "_cleanse_url", str)
+        yield
+
+
+@pytest.fixture(scope="session")
+def audio_data_example():
+    # Parsed once for the whole session; tests that mutate the data must take
+    # a deepcopy first.
+    return load_resource("jamendo", "audio_data_example.json")
+
+
+@pytest.fixture(scope="session")
+def page1():
+    return load_resource("jamendo", "page1.json")